@@ -31,9 +31,9 @@ class Sdm120(Device):
         Padding(0x26 * 2),
         "Frequency" / Float32b,
         "ActiveImport" / Float32b,
-        "ActiveExpoert" / Float32b,
+        "ActiveExport" / Float32b,
         "ReactiveImport" / Float32b,
-        "ReactiveExpoert" / Float32b,
+        "ReactiveExport" / Float32b,
         )
 
     TOPICS = MappingProxyType({
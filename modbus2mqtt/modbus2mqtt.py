@@ -9,6 +9,7 @@ from aiomqtt import MqttError
 from modbus2mqtt import __version__
 from modbus2mqtt.config import parse_config
 from modbus2mqtt.modbus_gateway import modbus_gateway
+from modbus2mqtt.profile import default_cache_dir, load_profiles
 
 
 def parse_args() -> Namespace:
@@ -44,6 +45,17 @@ async def async_main() -> int:
         logging.error("Failure while reading configuration file '%s': %r" % (args.conf_file, e))
         return -1
 
+    try:
+        profile_cache = config['modbus'].get('profile_cache')
+        profile_classes = load_profiles(
+            config['modbus'].get('profiles', []),
+            cache_dir=Path(profile_cache).expanduser() if profile_cache is not None else default_cache_dir(),
+            base_dir=args.conf_file.parent,
+        )
+    except Exception as e:
+        logging.error("Failure while loading device profiles: %r" % e)
+        return -1
+
     while True:
         try:
             async with MqttClient(
@@ -56,7 +68,7 @@ async def async_main() -> int:
 
                 async with asyncio.TaskGroup() as tg:
                     for name, gateway_config in config['modbus']['gateways'].items():
-                        tg.create_task(modbus_gateway(name=name, config=gateway_config, mqtt_client=mqtt_client, mqtt_prefix=mqtt_prefix, classes_config=config['modbus'].get('classes', {})))
+                        tg.create_task(modbus_gateway(name=name, config=gateway_config, mqtt_client=mqtt_client, mqtt_prefix=mqtt_prefix, classes_config=config['modbus'].get('classes', {}), profile_classes=profile_classes))
 
                 return 0
 
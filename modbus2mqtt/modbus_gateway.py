@@ -10,7 +10,26 @@ from modbus2mqtt.exceptions import InvalidConfigurationError
 from modbus2mqtt.util import to_camel_case
 
 
-async def modbus_gateway(name: str, config: dict, mqtt_client: MqttClient, mqtt_prefix: str, classes_config: dict):
+def device_class(class_name: str, profile_classes: dict):
+    if class_name in profile_classes:
+        return profile_classes[class_name]
+
+    try:
+        module = importlib.import_module(f".devices.{class_name}", __package__)
+    except ModuleNotFoundError:
+        raise InvalidConfigurationError(f"Class '{class_name}' not supported.")
+
+    camel_case_name = to_camel_case(class_name)
+
+    if not hasattr(module, camel_case_name):
+        raise InvalidConfigurationError(f"Class '{class_name}' not supported.")
+
+    return getattr(module, camel_case_name)
+
+
+async def modbus_session(
+    name: str, config: dict, devices: dict, mqtt_client: MqttClient, mqtt_prefix: str, classes_config: dict, profile_classes: dict,
+):
     while True:
         try:
             try:
@@ -26,26 +45,12 @@ async def modbus_gateway(name: str, config: dict, mqtt_client: MqttClient, mqtt_
                     # await client.connect()
 
                     if client.connected:
-                        if config.get("devices") is None:
-                            logging.info(f"No devices defined for gateway {name}.")
-                            return
-
                         async with asyncio.TaskGroup() as tg:
-                            for unit, device_config in config.get("devices").items():
-                                try:
-                                    module = importlib.import_module(f".devices.{device_config['class']}", __package__)
-                                except ModuleNotFoundError:
-                                    raise InvalidConfigurationError(f"Class '{device_config['class']}' not supported.")
-
-                                class_name = to_camel_case(device_config["class"])
-
-                                if not hasattr(module, class_name):
-                                    raise InvalidConfigurationError(f"Class '{device_config['class']}' not supported.")
-
-                                class_ = getattr(module, class_name)
+                            for unit, device_config in devices.items():
+                                class_ = device_class(device_config["class"], profile_classes)
 
                                 device_config_merged = classes_config.get(device_config["class"], {}).copy()
-                                device_config_merged.update({k: v for k, v in device_config.items() if k != "class"})
+                                device_config_merged.update({k: v for k, v in device_config.items() if k not in ("class", "bus")})
 
                                 device = class_(
                                     client=client,
@@ -77,3 +82,48 @@ async def modbus_gateway(name: str, config: dict, mqtt_client: MqttClient, mqtt_
         except asyncio.CancelledError:
             logging.info(f"Task for gateway {name} cancelled.")
             return
+
+
+def gateway_sessions(name: str, config: dict) -> dict:
+    """Group the devices of a gateway by bus and return {bus: (session_config, devices)}."""
+    sessions = config.get("sessions", 1)
+    if not isinstance(sessions, int) or isinstance(sessions, bool) or sessions < 1:
+        raise InvalidConfigurationError(f"Number of sessions for gateway {name} must be a positive integer.")
+
+    # Devices on the same bus share one connection, every bus gets its own connection so they are polled in parallel.
+    # Named buses are keyed by string and round-robin slots by int, so pinning a device never joins a slot by accident.
+    bus_configs = {str(bus): bus_config for bus, bus_config in (config.get("buses") or {}).items()}
+    buses = {}
+    slot = 0
+    for unit, device_config in config["devices"].items():
+        if device_config.get("bus") is not None:
+            bus = str(device_config["bus"])
+        else:
+            bus = slot
+            slot = (slot + 1) % sessions
+        buses.setdefault(bus, {})[unit] = device_config
+
+    return {bus: ({**config, **bus_configs.get(bus, {})}, devices) for bus, devices in buses.items()}
+
+
+async def modbus_gateway(
+    name: str, config: dict, mqtt_client: MqttClient, mqtt_prefix: str, classes_config: dict, profile_classes: dict,
+):
+    if config.get("devices") is None:
+        logging.info(f"No devices defined for gateway {name}.")
+        return
+
+    sessions = gateway_sessions(name, config)
+
+    async with asyncio.TaskGroup() as tg:
+        for bus, (session_config, devices) in sessions.items():
+            session_name = f"{name}/{bus}" if isinstance(bus, str) else f"{name}/#{bus}"
+            tg.create_task(modbus_session(
+                name=name if len(sessions) == 1 else session_name,
+                config=session_config,
+                devices=devices,
+                mqtt_client=mqtt_client,
+                mqtt_prefix=mqtt_prefix,
+                classes_config=classes_config,
+                profile_classes=profile_classes,
+            ))
@@ -0,0 +1,346 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from types import MappingProxyType
+
+from construct import (
+    Float32b,
+    Float64b,
+    Int8sb,
+    Int8ub,
+    Int16sb,
+    Int16ub,
+    Int32sb,
+    Int32ub,
+    Int64sb,
+    Int64ub,
+    PaddedString,
+    Padding,
+    StringError,
+    Struct,
+)
+from yaml import YAMLError, safe_load
+
+from modbus2mqtt.profile_device import Block, ProfileDevice, Scaled
+from modbus2mqtt.exceptions import InvalidConfigurationError
+from modbus2mqtt.util import to_camel_case
+
+# Bump whenever the normalized profile format changes to invalidate existing cache entries.
+CACHE_VERSION = 3
+
+TABLES = ("holding", "input")
+
+BUNDLED_PROFILES_DIR = Path(__file__).parent / "profiles"
+
+# Maximum number of registers a single Modbus read may return.
+MAX_REGISTERS_PER_READ = 125
+
+INTEGER_TYPES = MappingProxyType({
+    "int8": (Int8sb, 1, 2**7 - 1),
+    "uint8": (Int8ub, 1, 2**8 - 1),
+    "int16": (Int16sb, 2, 2**15 - 1),
+    "uint16": (Int16ub, 2, 2**16 - 1),
+    "int32": (Int32sb, 4, 2**31 - 1),
+    "uint32": (Int32ub, 4, 2**32 - 1),
+    "int64": (Int64sb, 8, 2**63 - 1),
+    "uint64": (Int64ub, 8, 2**64 - 1),
+})
+
+FLOAT_TYPES = MappingProxyType({
+    "float32": (Float32b, 4),
+    "float64": (Float64b, 8),
+})
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "modbus2mqtt" / "profiles"
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _normalize_field(field: dict, base: int, offset: int, where: str) -> tuple[dict | None, int]:
+    if not isinstance(field, dict):
+        raise InvalidConfigurationError(f"{where}: field must be a mapping.")
+
+    if "skip" in field:
+        if set(field) != {"skip"} or not _is_int(field["skip"]) or field["skip"] <= 0:
+            raise InvalidConfigurationError(f"{where}: 'skip' must be a positive register count on its own.")
+        return None, offset + field["skip"] * 2
+
+    if "address" in field:
+        if not _is_int(field["address"]) or (field["address"] - base) * 2 < offset:
+            raise InvalidConfigurationError(f"{where}: address must not lie before the end of the previous field.")
+        offset = (field["address"] - base) * 2
+
+    name = field.get("name")
+    if not isinstance(name, str) or not name:
+        raise InvalidConfigurationError(f"{where}: field needs a 'name'.")
+
+    topic = field.get("topic")
+    if topic is not None and (not isinstance(topic, str) or not topic):
+        raise InvalidConfigurationError(f"{where}: topic of '{name}' must be a non-empty string.")
+
+    field_type = field.get("type")
+    normalized = {"name": name, "type": field_type, "offset": offset, "topic": topic}
+
+    if field_type in INTEGER_TYPES:
+        _, size, maximum_value = INTEGER_TYPES[field_type]
+        sentinel = field.get("sentinel")
+        if sentinel == "max":
+            sentinel = maximum_value
+        elif sentinel is not None and not _is_int(sentinel):
+            raise InvalidConfigurationError(f"{where}: sentinel of '{name}' must be an integer or 'max'.")
+        normalized["scale"] = field.get("scale")
+        normalized["sentinel"] = sentinel
+
+    elif field_type in FLOAT_TYPES:
+        _, size = FLOAT_TYPES[field_type]
+        if "sentinel" in field:
+            raise InvalidConfigurationError(f"{where}: sentinel not supported for '{field_type}' field '{name}'.")
+        normalized["scale"] = field.get("scale")
+
+    elif field_type == "string":
+        if not _is_int(field.get("registers")) or field["registers"] <= 0:
+            raise InvalidConfigurationError(f"{where}: string field '{name}' needs a positive 'registers' length.")
+        size = field["registers"] * 2
+        normalized["size"] = size
+        normalized["encoding"] = field.get("encoding", "ASCII")
+        try:
+            PaddedString(size, encoding=normalized["encoding"])
+        except (StringError, AttributeError) as e:
+            raise InvalidConfigurationError(f"{where}: unsupported encoding for '{name}': {normalized['encoding']!r}.") from e
+
+    else:
+        raise InvalidConfigurationError(f"{where}: unknown type '{field_type}' for field '{name}'.")
+
+    if normalized.get("scale") is not None and not _is_number(normalized["scale"]):
+        raise InvalidConfigurationError(f"{where}: scale of '{name}' must be a number.")
+
+    return normalized, offset + size
+
+
+def _normalize_block(block: dict, where: str) -> dict:
+    if not isinstance(block, dict):
+        raise InvalidConfigurationError(f"{where}: block must be a mapping.")
+
+    table = block.get("table", "holding")
+    if table not in TABLES:
+        raise InvalidConfigurationError(f"{where}: table must be one of {', '.join(TABLES)}.")
+
+    address = block.get("address")
+    if not _is_int(address) or address < 0:
+        raise InvalidConfigurationError(f"{where}: block needs a non-negative 'address'.")
+
+    if not isinstance(block.get("fields"), list) or not block["fields"]:
+        raise InvalidConfigurationError(f"{where}: block at {address:#x} has no fields.")
+
+    fields = []
+    offset = 0
+    for index, field in enumerate(block["fields"]):
+        normalized, offset = _normalize_field(field, address, offset, f"{where}, field {index}")
+        if normalized is not None:
+            fields.append(normalized)
+
+    if offset % 2:
+        raise InvalidConfigurationError(f"{where}: block at {address:#x} doesn't end on a register boundary.")
+
+    count = offset // 2
+    if count > MAX_REGISTERS_PER_READ:
+        raise InvalidConfigurationError(
+            f"{where}: block at {address:#x} spans {count} registers, at most {MAX_REGISTERS_PER_READ} can be read at once.",
+        )
+    if address + count > 0x10000:
+        raise InvalidConfigurationError(f"{where}: block at {address:#x} exceeds the register address range.")
+
+    names = [field["name"] for field in fields]
+    if len(names) != len(set(names)):
+        raise InvalidConfigurationError(f"{where}: block at {address:#x} has duplicate field names.")
+
+    return {"table": table, "address": address, "count": count, "fields": fields}
+
+
+def compile_profile(data: dict, name: str, where: str) -> dict:
+    """Validate a profile as loaded from YAML and normalize it into plain, JSON serializable data."""
+    if not isinstance(data, dict):
+        raise InvalidConfigurationError(f"{where}: profile must be a mapping.")
+
+    interval = data.get("interval", 5)
+    intervals = data.get("intervals", {})
+    if not _is_number(interval) or interval <= 0:
+        raise InvalidConfigurationError(f"{where}: interval must be a positive number.")
+    if not isinstance(intervals, dict) or not all(isinstance(k, str) and _is_number(v) and v > 0 for k, v in intervals.items()):
+        raise InvalidConfigurationError(f"{where}: intervals must map topic regexes to positive numbers.")
+    for topic_regex in intervals:
+        try:
+            re.compile(topic_regex)
+        except re.error as e:
+            raise InvalidConfigurationError(f"{where}: invalid interval regex '{topic_regex}': {e}") from e
+
+    profile_name = data.get("name", name)
+    if not isinstance(profile_name, str) or not profile_name:
+        raise InvalidConfigurationError(f"{where}: name must be a non-empty string.")
+
+    if not isinstance(data.get("static", []), list) or not isinstance(data.get("blocks", []), list):
+        raise InvalidConfigurationError(f"{where}: static and blocks must be lists.")
+
+    static = [_normalize_block(block, f"{where}, static block {i}") for i, block in enumerate(data.get("static", []))]
+    blocks = [_normalize_block(block, f"{where}, block {i}") for i, block in enumerate(data.get("blocks", []))]
+
+    if not any(field["topic"] is not None for block in blocks for field in block["fields"]):
+        raise InvalidConfigurationError(f"{where}: profile has no polled field with a topic.")
+
+    identifier = data.get("identifier")
+    if identifier is not None and not isinstance(identifier, str):
+        raise InvalidConfigurationError(f"{where}: identifier must be a string.")
+    if identifier is not None and identifier not in {field["name"] for block in static for field in block["fields"]}:
+        raise InvalidConfigurationError(f"{where}: identifier '{identifier}' is not a field of a static block.")
+
+    return {
+        "name": profile_name,
+        "identifier": identifier,
+        "interval": interval,
+        "intervals": intervals,
+        "static": static,
+        "blocks": blocks,
+    }
+
+
+def _build_block(block: dict) -> Block:
+    subcons = []
+    offset = 0
+    for field in block["fields"]:
+        if field["offset"] > offset:
+            subcons.append(Padding(field["offset"] - offset))
+
+        if field["type"] in INTEGER_TYPES:
+            subcon, size, _ = INTEGER_TYPES[field["type"]]
+            if field["scale"] is not None or field["sentinel"] is not None:
+                subcon = Scaled(field["scale"], field["sentinel"], subcon)
+        elif field["type"] in FLOAT_TYPES:
+            subcon, size = FLOAT_TYPES[field["type"]]
+            if field["scale"] is not None:
+                subcon = Scaled(field["scale"], None, subcon)
+        else:
+            size = field["size"]
+            subcon = PaddedString(size, encoding=field["encoding"])
+
+        subcons.append(field["name"] / subcon)
+        offset = field["offset"] + size
+
+    if block["count"] * 2 > offset:
+        subcons.append(Padding(block["count"] * 2 - offset))
+
+    return Block(
+        table=block["table"],
+        address=block["address"],
+        count=block["count"],
+        struct=Struct(*subcons),
+        topics=MappingProxyType({field["name"]: field["topic"] for field in block["fields"] if field["topic"] is not None}),
+    )
+
+
+def profile_class(profile: dict) -> type[ProfileDevice]:
+    """Create a Device subclass with the decode structs and read plan of a normalized profile."""
+    return type(
+        to_camel_case(profile["name"]),
+        (ProfileDevice,),
+        {
+            "IDENTIFIER": profile["identifier"],
+            "INTERVAL": profile["interval"],
+            "INTERVALS": MappingProxyType(profile["intervals"]),
+            "STATIC_BLOCKS": tuple(_build_block(block) for block in profile["static"]),
+            "BLOCKS": tuple(_build_block(block) for block in profile["blocks"]),
+        },
+    )
+
+
+PROFILE_KEYS = frozenset({"name", "identifier", "interval", "intervals", "static", "blocks"})
+
+
+def _read_cache(cache_file: Path, digest: str) -> dict | None:
+    try:
+        with cache_file.open() as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(entry, dict) or entry.get("digest") != digest:
+        return None
+
+    profile = entry.get("profile")
+    if not isinstance(profile, dict) or set(profile) != PROFILE_KEYS:
+        return None
+
+    return profile
+
+
+def load_profile(filename: Path, cache_dir: Path | None = None) -> dict:
+    """Load a normalized profile, reusing its on-disk cache entry if it matches the file's hash."""
+    content = filename.read_bytes()
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{filename.stem}:".encode() + content).hexdigest()
+
+    # One entry per profile file, so editing a profile replaces its entry instead of adding another one.
+    cache_file = None
+    if cache_dir is not None:
+        path_digest = hashlib.sha256(str(filename.resolve()).encode()).hexdigest()[:16]
+        cache_file = cache_dir / f"{filename.stem}-{path_digest}.json"
+
+        profile = _read_cache(cache_file, digest)
+        if profile is not None:
+            return profile
+
+    try:
+        data = safe_load(content)
+    except YAMLError as e:
+        raise InvalidConfigurationError(f"Can't load profile {filename}: {e}") from e
+
+    profile = compile_profile(data, name=filename.stem, where=str(filename))
+
+    if cache_file is not None:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_file.open("w") as f:
+                json.dump({"digest": digest, "profile": profile}, f)
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            logging.warning(f"Can't write profile cache {cache_file}: {e}")
+
+    return profile
+
+
+def _profile_files(entry: str | Path, base_dir: Path | None) -> list[Path]:
+    bundled = BUNDLED_PROFILES_DIR / f"{entry}.yaml"
+    if isinstance(entry, str) and re.fullmatch(r"\w+", entry) and bundled.is_file():
+        return [bundled]
+
+    path = Path(entry).expanduser()
+    if base_dir is not None:
+        path = base_dir / path
+
+    if path.is_dir():
+        return sorted([*path.glob("*.yaml"), *path.glob("*.yml")])
+
+    return [path]
+
+
+def load_profiles(paths: list, cache_dir: Path | None = None, base_dir: Path | None = None) -> dict[str, type[ProfileDevice]]:
+    """Load bundled profiles by name and profiles from files or directories and return device classes by profile name."""
+    classes = {}
+    for entry in paths:
+        for filename in _profile_files(entry, base_dir):
+            profile = load_profile(filename, cache_dir)
+            if profile["name"] in classes:
+                raise InvalidConfigurationError(f"Profile '{profile['name']}' defined more than once ({filename}).")
+            classes[profile["name"]] = profile_class(profile)
+
+    return classes
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import re
+from datetime import UTC, datetime
+from struct import pack
+from types import MappingProxyType
+from typing import NamedTuple
+
+from construct import Adapter, Struct
+
+from modbus2mqtt.devices import Device
+
+
+class Scaled(Adapter):
+    def __init__(self, factor: float | None, sentinel: int | None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.factor = factor
+        self.sentinel = sentinel
+
+    def _decode(self, obj, context, path):
+        if self.sentinel is not None and obj == self.sentinel:
+            return None
+
+        if self.factor is None:
+            return obj
+
+        return obj * self.factor
+
+    def _encode(self, obj, context, path):
+        if obj is None:
+            return self.sentinel
+
+        if self.factor is None:
+            return obj
+
+        return obj / self.factor
+
+
+class Block(NamedTuple):
+    table: str
+    address: int
+    count: int
+    struct: Struct
+    topics: MappingProxyType
+
+
+class ProfileDevice(Device):
+    """Generic device driven by a compiled register-map profile (see modbus2mqtt.profile)."""
+
+    IDENTIFIER: str | None = None
+    INTERVAL: float = 5
+    INTERVALS: MappingProxyType = MappingProxyType({})
+    STATIC_BLOCKS: tuple[Block, ...] = ()
+    BLOCKS: tuple[Block, ...] = ()
+
+    async def _read(self, block: Block):
+        if block.table == "input":
+            response = await self.client.read_input_registers(address=block.address, count=block.count, slave=self.unit)
+        else:
+            response = await self.client.read_holding_registers(address=block.address, count=block.count, slave=self.unit)
+
+        return block.struct.parse(pack(f">{len(response.registers)}H", *response.registers))
+
+    def _interval(self, topic: str) -> float:
+        for intervals in (self.config.get("intervals", {}), self.INTERVALS):
+            for topic_regex, topic_interval in intervals.items():
+                if re.match(topic_regex, topic):
+                    return topic_interval
+
+        return self.config.get("interval", self.INTERVAL)
+
+    async def get_messages(self):
+        parsed_static_blocks = [(block, await self._read(block)) for block in self.STATIC_BLOCKS]
+
+        prefix = ""
+        if self.IDENTIFIER is not None:
+            for _, parsed in parsed_static_blocks:
+                if self.IDENTIFIER in parsed:
+                    prefix = f"{parsed[self.IDENTIFIER]}/"
+                    break
+            else:
+                logging.error(f"Could not read identifier '{self.IDENTIFIER}'.")
+                return
+
+        for block, parsed in parsed_static_blocks:
+            for name, topic in block.topics.items():
+                value = parsed.get(name)
+                if value is not None:
+                    yield {'topic': f"{prefix}{topic}", 'payload': value, 'retain': True}
+
+        blocks = [block for block in self.BLOCKS if block.topics]
+        if not blocks:
+            # Nothing to poll; returning would make Device.task re-read and republish the static blocks right away.
+            await asyncio.Event().wait()
+
+        intervals = {topic: self._interval(topic) for block in blocks for topic in block.topics.values()}
+        next_send = {}
+
+        while True:
+            now = datetime.now(tz=UTC).timestamp()
+
+            for block in blocks:
+                due = [(name, topic) for name, topic in block.topics.items() if now > next_send.get(topic, 0)]
+                if not due:
+                    continue
+
+                parsed = await self._read(block)
+
+                for name, topic in due:
+                    interval = intervals[topic]
+                    next_send[topic] = (now // interval + 1) * interval
+
+                    value = parsed.get(name)
+                    if value is not None:
+                        yield {'topic': f"{prefix}{topic}", 'payload': value}
+
+            next_wakeup = min(next_send.values())
+
+            await asyncio.sleep(next_wakeup - datetime.now(tz=UTC).timestamp())
@@ -0,0 +1,50 @@
+import pytest
+
+from modbus2mqtt.exceptions import InvalidConfigurationError
+from modbus2mqtt.modbus_gateway import gateway_sessions
+
+
+def _gateway(devices, **kwargs):
+    return {"address": "gateway", "port": 502, "devices": devices, **kwargs}
+
+
+def _units(sessions):
+    return {bus: list(devices) for bus, (_, devices) in sessions.items()}
+
+
+def test_single_session_by_default():
+    sessions = gateway_sessions("gw", _gateway({1: {"class": "a"}, 2: {"class": "a"}}))
+
+    assert _units(sessions) == {0: [1, 2]}
+    assert sessions[0][0]["port"] == 502
+
+
+def test_round_robin_skips_pinned_devices():
+    devices = {1: {"bus": "a"}, 2: {}, 3: {"bus": "a"}, 4: {}, 6: {}}
+    sessions = gateway_sessions("gw", _gateway(devices, sessions=2))
+
+    assert _units(sessions) == {"a": [1, 3], 0: [2, 6], 1: [4]}
+
+
+def test_numeric_bus_does_not_join_round_robin_slot():
+    devices = {1: {"bus": 0}, 2: {}, 3: {}}
+    sessions = gateway_sessions("gw", _gateway(devices, sessions=2))
+
+    assert _units(sessions) == {"0": [1], 0: [2], 1: [3]}
+
+
+def test_bus_overrides():
+    devices = {1: {"bus": "rs485-2"}, 2: {"bus": 3}, 4: {}}
+    sessions = gateway_sessions("gw", _gateway(devices, buses={"rs485-2": {"port": 503}, 3: {"address": "other"}}))
+
+    assert sessions["rs485-2"][0]["port"] == 503
+    assert sessions["rs485-2"][0]["address"] == "gateway"
+    assert sessions["3"][0]["address"] == "other"
+    assert sessions["3"][0]["port"] == 502
+    assert sessions[0][0]["port"] == 502
+
+
+@pytest.mark.parametrize("value", [0, -1, "2", True, 1.5])
+def test_invalid_sessions(value):
+    with pytest.raises(InvalidConfigurationError):
+        gateway_sessions("gw", _gateway({1: {}}, sessions=value))
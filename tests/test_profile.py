@@ -0,0 +1,159 @@
+import random
+
+import pytest
+import yaml
+
+from modbus2mqtt import profile as profile_module
+from modbus2mqtt.devices.abb_meter import AbbMeter
+from modbus2mqtt.devices.growatt_inverter import GrowattInverter
+from modbus2mqtt.devices.sdm120 import Sdm120
+from modbus2mqtt.exceptions import InvalidConfigurationError
+from modbus2mqtt.profile import BUNDLED_PROFILES_DIR, compile_profile, load_profile, load_profiles
+
+
+@pytest.fixture(scope="module")
+def profile_classes():
+    return load_profiles([BUNDLED_PROFILES_DIR])
+
+
+def _field_names(struct):
+    return {subcon.name for subcon in struct.subcons if subcon.name is not None}
+
+
+def _printable_bytes(size):
+    rng = random.Random(size)
+    return bytes(rng.randrange(0x20, 0x7F) for _ in range(size))
+
+
+@pytest.mark.parametrize(("profile_name", "kind", "index", "table", "address", "struct", "topics"), [
+    ("abb_meter", "STATIC_BLOCKS", 0, "holding", 0x8900, AbbMeter.PRODUCTDATA_AND_IDENTIFICATION,
+     AbbMeter.PRODUCTDATA_AND_IDENTIFICATION_TOPICS),
+    ("abb_meter", "BLOCKS", 0, "holding", 0x5000, AbbMeter.ENERGY_TOTAL, AbbMeter.TOPICS),
+    ("abb_meter", "BLOCKS", 1, "holding", 0x5460, AbbMeter.ENERGY_PER_PHASE, AbbMeter.TOPICS),
+    ("abb_meter", "BLOCKS", 2, "holding", 0x5B00, AbbMeter.MEASUREMENTS, AbbMeter.TOPICS),
+    ("sdm120", "STATIC_BLOCKS", 0, "holding", 0xFC00, Sdm120.SERIAL_NUMBER, {}),
+    ("sdm120", "BLOCKS", 0, "input", 0x0000, Sdm120.MEASUREMENTS, Sdm120.TOPICS),
+    ("growatt_inverter", "STATIC_BLOCKS", 0, "holding", 3000, GrowattInverter.HOLDING_FRAME1, {}),
+    ("growatt_inverter", "BLOCKS", 0, "input", 0, GrowattInverter.INPUT_FRAME1, GrowattInverter.DATAPOINTS),
+])
+def test_profile_decodes_like_builtin_class(profile_classes, profile_name, kind, index, table, address, struct, topics):
+    block = getattr(profile_classes[profile_name], kind)[index]
+
+    assert block.table == table
+    assert block.address == address
+    assert block.count == struct.sizeof() // 2
+
+    common_names = _field_names(struct) & _field_names(block.struct)
+    assert common_names
+
+    data = _printable_bytes(struct.sizeof())
+    expected = struct.parse(data)
+    parsed = block.struct.parse(data)
+    for name in common_names:
+        assert parsed[name] == expected[name], name
+
+    assert dict(block.topics) == {name: topic for name, topic in topics.items() if name in common_names}
+
+
+def test_abb_meter_profile_sentinels(profile_classes):
+    for block, struct in zip(profile_classes["abb_meter"].BLOCKS,
+                             [AbbMeter.ENERGY_TOTAL, AbbMeter.ENERGY_PER_PHASE, AbbMeter.MEASUREMENTS], strict=True):
+        data = b"\x7f" + b"\xff" * (struct.sizeof() - 1)
+        expected = struct.parse(data)
+        parsed = block.struct.parse(data)
+        for name in _field_names(struct) & _field_names(block.struct):
+            assert parsed[name] == expected[name], name
+
+
+def test_profiles_by_bundled_name_and_relative_path(tmp_path):
+    (tmp_path / "profiles").mkdir()
+    (tmp_path / "profiles" / "meter.yaml").write_text(yaml.safe_dump(_profile()))
+
+    classes = load_profiles(["sdm120", "profiles"], base_dir=tmp_path)
+    assert classes.keys() == {"sdm120", "meter"}
+
+
+def test_second_load_is_served_from_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    first = load_profiles([BUNDLED_PROFILES_DIR], cache_dir)
+    assert len(list(cache_dir.iterdir())) == len(first)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("profile parsed again")
+
+    monkeypatch.setattr(profile_module, "safe_load", fail)
+    second = load_profiles([BUNDLED_PROFILES_DIR], cache_dir)
+    assert second.keys() == first.keys()
+
+
+def test_cache_keeps_one_entry_per_profile(tmp_path):
+    cache_dir = tmp_path / "cache"
+    filename = tmp_path / "meter.yaml"
+
+    for interval in (5, 10, 15):
+        filename.write_text(yaml.safe_dump(_profile(interval=interval)))
+        assert load_profile(filename, cache_dir)["interval"] == interval
+
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_malformed_cache_entry_is_rebuilt(tmp_path):
+    cache_dir = tmp_path / "cache"
+    filename = tmp_path / "meter.yaml"
+    filename.write_text(yaml.safe_dump(_profile(interval=7)))
+
+    load_profile(filename, cache_dir)
+    (cache_file,) = cache_dir.iterdir()
+    cache_file.write_text("{}")
+
+    assert load_profile(filename, cache_dir)["interval"] == 7
+
+
+VALUE = {"name": "Value", "type": "uint16", "topic": "value"}
+
+
+def _profile(*fields, **kwargs):
+    return {"blocks": [{"address": 0, "fields": [*fields, VALUE]}], **kwargs}
+
+
+def test_minimal_profile():
+    assert compile_profile(_profile(), name="test", where="test")["blocks"][0]["count"] == 1
+
+
+def test_largest_block():
+    data = _profile({"name": "Other", "type": "string", "registers": 124, "encoding": "utf-8"})
+    assert compile_profile(data, name="test", where="test")["blocks"][0]["count"] == 125
+
+
+@pytest.mark.parametrize("data", [
+    {},
+    {"interval": 5},
+    {"blocks": [{"address": 0, "fields": [{"name": "Value", "type": "uint16"}]}]},
+    {"static": [{"address": 0, "fields": [VALUE]}]},
+    _profile({"name": "Other", "type": "uint16", "topic": 5}),
+    _profile({"name": "Other", "type": "uint16", "topic": ""}),
+    _profile(name=5),
+    _profile(intervals={"(": 5}),
+    _profile(intervals={"^energy": True}),
+    _profile({"skip": True}),
+    _profile({"name": "Other", "type": "uint16", "address": True}),
+    _profile({"name": "Other", "type": "string", "registers": True}),
+    _profile({"name": "Other", "type": "uint16", "sentinel": False}),
+    _profile({"name": "Other", "type": "uint8"}),
+    _profile({"name": "Value", "type": "uint16"}),
+    _profile({"name": "Other", "type": "bool"}),
+    _profile(identifier="SerialNumber"),
+    _profile({"name": "Other", "type": "string", "registers": 2, "encoding": "nope"}),
+    _profile({"name": "Other", "type": "string", "registers": 2, "encoding": 5}),
+    _profile({"name": "Other", "type": "uint16", "address": 125}),
+    {"blocks": [{"address": 0xFFFF, "fields": [{"name": "Value", "type": "uint32", "topic": "value"}]}]},
+])
+def test_invalid_profile(data):
+    with pytest.raises(InvalidConfigurationError):
+        compile_profile(data, name="test", where="test")
+
+
+@pytest.mark.parametrize("name", ["abb_meter", "sdm120", "growatt_inverter"])
+def test_bundled_profiles_keep_builtin_default_interval(profile_classes, name):
+    assert profile_classes[name].INTERVAL == 5
+    assert not profile_classes[name].INTERVALS
@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from modbus2mqtt import profile_device
+from modbus2mqtt.profile import compile_profile, profile_class
+
+
+class FakeClient:
+    def __init__(self, holding=None, inputs=None):
+        self.tables = {"holding": holding or {}, "input": inputs or {}}
+        self.reads = []
+
+    async def _read(self, table, address, count):
+        self.reads.append((table, address))
+        return SimpleNamespace(registers=[self.tables[table].get(address + i, 0) for i in range(count)])
+
+    async def read_holding_registers(self, address, count, slave):
+        return await self._read("holding", address, count)
+
+    async def read_input_registers(self, address, count, slave):
+        return await self._read("input", address, count)
+
+
+def _device(data, client, config=None):
+    class_ = profile_class(compile_profile(data, name="test", where="test"))
+    return class_(client=client, unit=1, mqtt_client=None, mqtt_prefix="test/", config=config or {})
+
+
+async def _collect(device, count):
+    messages = []
+    async for message in device.get_messages():
+        messages.append(message)
+        if len(messages) == count:
+            break
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_unused_polled_blocks_wait_instead_of_returning():
+    client = FakeClient(holding={0: 42})
+    device = _device({
+        "static": [{"address": 0, "fields": [{"name": "Serial", "type": "uint16", "topic": "serial"}]}],
+        "blocks": [{"address": 10, "fields": [{"name": "Value", "type": "uint16", "topic": "value"}]}],
+    }, client)
+    # Only the topic-less blocks remain, as for a hand-written ProfileDevice subclass without polled topics.
+    type(device).BLOCKS = ()
+
+    task = asyncio.create_task(_collect(device, 2))
+    await asyncio.sleep(0.05)
+
+    assert not task.done()
+    assert client.reads == [("holding", 0)]
+    task.cancel()
+
+
+class FakeClock:
+    def __init__(self, timestamp):
+        self.timestamp = timestamp
+
+    def now(self, tz):
+        return SimpleNamespace(timestamp=lambda: self.timestamp)
+
+    async def sleep(self, delay):
+        self.timestamp += max(delay, 0) + 0.001
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(1000.5)
+    monkeypatch.setattr(profile_device, "datetime", clock)
+    monkeypatch.setattr(profile_device, "asyncio", SimpleNamespace(sleep=clock.sleep, Event=asyncio.Event))
+    return clock
+
+
+METER = {
+    "identifier": "Serial",
+    "interval": 10,
+    "intervals": {"^fast": 1},
+    "static": [{"address": 0, "fields": [
+        {"name": "Serial", "type": "uint16"},
+        {"name": "Version", "type": "uint16", "topic": "version"},
+    ]}],
+    "blocks": [
+        {"address": 10, "fields": [
+            {"name": "Fast", "type": "uint16", "scale": 0.5, "topic": "fast"},
+            {"name": "Missing", "type": "uint16", "sentinel": "max", "topic": "missing"},
+        ]},
+        {"table": "input", "address": 20, "fields": [{"name": "Slow", "type": "uint16", "topic": "slow"}]},
+    ],
+}
+
+
+@pytest.mark.asyncio
+async def test_static_blocks_are_published_retained_with_identifier_prefix(clock):
+    client = FakeClient(holding={0: 1234, 1: 7, 10: 4, 11: 0xFFFF}, inputs={20: 3})
+    messages = await _collect(_device(METER, client), 3)
+
+    assert messages == [
+        {"topic": "1234/version", "payload": 7, "retain": True},
+        {"topic": "1234/fast", "payload": 2.0},
+        {"topic": "1234/slow", "payload": 3},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_only_blocks_with_due_topics_are_read(clock):
+    client = FakeClient(holding={0: 1234, 11: 0xFFFF})
+    messages = await _collect(_device(METER, client), 11)
+
+    assert [message["topic"] for message in messages] == ["1234/version", "1234/fast", "1234/slow"] + ["1234/fast"] * 8
+    assert client.reads == [("holding", 0), ("holding", 10), ("input", 20)] + [("holding", 10)] * 8
+
+
+@pytest.mark.asyncio
+async def test_configured_intervals_take_precedence_over_profile(clock):
+    client = FakeClient(holding={0: 1234, 11: 0xFFFF})
+    messages = await _collect(_device(METER, client, config={"intervals": {"^slow": 1}}), 6)
+
+    assert [message["topic"] for message in messages[1:]] == ["1234/fast", "1234/slow"] * 2 + ["1234/fast"]
+
+
+def test_interval_precedence():
+    device = _device(METER, FakeClient(), config={"interval": 3, "intervals": {"^fast/x": 2}})
+
+    assert device._interval("fast/x") == 2
+    assert device._interval("fast") == 1
+    assert device._interval("slow") == 3
+    assert _device(METER, FakeClient())._interval("slow") == 10